@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'L3',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.2.0',
     'category': 'Sales',
     'summary': 'Add primary contact functionality, improve sale order product selection, express delivery, split order lines, activity salesperson enhancement, and date panel in top bar',
     'description': """
@@ -58,11 +58,13 @@
         'reports/invoice_payment_report.xml',
         'security/ir.model.access.xml',
         'data/email_templates.xml',
+        'data/ir_cron_data.xml',
         'wizard/split_order_lines_wizard_views.xml',
+        'wizard/sale_order_pdf_export_wizard_views.xml',
+        'views/sale_order_pdf_export_views.xml',
         'views/res_partner_views.xml',
         'views/sale_order_views.xml',
         'views/stock_picking_views.xml',
-        'views/o2m_single_line_widget.xml',  # Виджет для ограничения пустых строк в o2m полях
         # 'views/mail_activity_views.xml',  # Временно отключено для исправления ошибки
     ],
     'test': [
@@ -70,30 +72,25 @@
         'tests/test_sale_order.py',
     ],
     'assets': {
-        'web.assets_backend': [
-            'L3/static/src/css/partner_kanban.css',
-            'L3/static/src/css/partner_kanban_simple.css',
+        # Все ресурсы L3 собраны в одном бандле без дублирующих вариантов
+        'L3.assets_backend': [
+            'L3/static/src/css/partner_kanban.css',  # CSS основного контакта (канбан, переключатели, диалог)
             'L3/static/src/css/product_selector.css',
             'L3/static/src/css/partner_no_highlight.css',  # CSS для убирания красной подсветки поля Partner
-            'L3/static/src/css/order_line_single.css',  # CSS для ограничения пустых строк в order_line
-            'L3/static/src/css/o2m_single_line.css',  # Универсальный CSS для o2m полей
             'L3/static/src/css/date_panel.css',  # CSS для панели даты
-            'L3/static/src/js/date_panel_final.js',  # JavaScript для панели даты
-            'L3/static/src/js/activity_popup_salesperson.js',  # JavaScript для добавления salesperson во всплывающие окна активностей
-            'L3/static/src/js/order_line_single_row.js',  # JavaScript для ограничения количества пустых строк в order_line
-            'L3/static/src/js/order_line_single_widget.js',  # Кастомный виджет для order_line
-            'L3/static/src/js/order_line_force_single.js',  # Принудительное удаление лишних пустых строк
-            'L3/static/src/js/order_line_remove_empty.js',  # Удаление пустых строк из DOM
-            'L3/static/src/js/o2m_single_line_widget.js',  # Универсальный виджет для o2m полей
-            'L3/static/src/js/single_line_widget.js',  # Основной виджет single_line
+            'L3/static/src/js/date_panel_final.js',  # Панель даты в системном трее
+            'L3/static/src/js/activity_popup_salesperson.js',  # Продавец во всплывающем окне активностей
+            'L3/static/src/xml/activity_popup_salesperson.xml',
+            'L3/static/src/js/order_line_single_widget.js',  # Поле order_line с одной пустой строкой
             # 'L3/static/src/js/activity_salesperson.js',  # Временно отключено для исправления ошибки
-            # 'L3/static/src/css/date_panel.css',  # CSS для панели даты - ОТКЛЮЧЕНО
-            # 'L3/static/src/js/date_panel_final.js',  # JavaScript для панели даты - ОТКЛЮЧЕНО
             # 'L3/static/src/css/sale_order_line_readonly_minimal.css',  # Временно отключено
             # 'L3/static/src/js/activity_salesperson_simple.js',  # Временно отключено
             # 'L3/static/src/css/sale_order_line_readonly.css',  # Отключена
             # 'L3/static/src/js/sale_order_line_readonly.js',  # Временно отключен
         ],
+        'web.assets_backend': [
+            ('include', 'L3.assets_backend'),
+        ],
     },
     'installable': True,
     'auto_install': False,
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Заполняем delivery_role для доставок, созданных до появления поля
+
+    Раньше регулярные и экспресс доставки различались только по тексту в note.
+    """
+    if not version:
+        return
+    cr.execute("""
+        UPDATE stock_picking
+           SET delivery_role = 'express'
+         WHERE delivery_role IS NULL
+           AND sale_id IS NOT NULL
+           AND (note ILIKE '%express%' OR note ILIKE '%экспресс%')
+    """)
+    cr.execute("""
+        UPDATE stock_picking
+           SET delivery_role = 'regular'
+         WHERE delivery_role IS NULL
+           AND sale_id IS NOT NULL
+           AND note ILIKE '%regular delivery%'
+    """)
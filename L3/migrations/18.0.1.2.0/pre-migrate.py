@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Подготовка к уникальному индексу основного контакта
+
+    Индекс res_partner_unique_primary_contact (см. res.partner.init) учитывает
+    только активные контакты. Если у компании несколько активных основных
+    контактов, основным остается последний измененный; архивные контакты не
+    трогаем. Индекс предыдущей версии (без условия active) удаляем, init
+    создаст его заново.
+    """
+    if not version:
+        return
+    cr.execute("DROP INDEX IF EXISTS res_partner_unique_primary_contact")
+    cr.execute("""
+        UPDATE res_partner
+           SET is_primary = FALSE
+         WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY parent_id ORDER BY write_date DESC NULLS LAST, id DESC
+                ) AS position
+                  FROM res_partner
+                 WHERE is_primary AND active AND parent_id IS NOT NULL
+            ) AS primaries
+             WHERE position > 1
+         )
+    """)
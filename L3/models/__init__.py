@@ -2,7 +2,12 @@
 
 from . import res_partner
 from . import stock_picking
+from . import stock_picking_type
+from . import stock_warehouse_orderpoint
 from . import sale_order
 from . import sale
-# from . import ir_config_parameter  # Временно отключено
+from . import sale_order_pdf_export
+from . import ir_actions_report
+from . import ir_config_parameter
+from . import ir_http
 from . import mail_activity  # Модель для добавления поля salesperson в активности
\ No newline at end of file
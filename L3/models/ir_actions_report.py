@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from collections import defaultdict
+
+from odoo import api, models
+
+_logger = logging.getLogger(__name__)
+
+# Имена закэшированных PDF: L3-<отчет>-<id заказа>-<язык>-<write_date>.pdf,
+# см. поле attachment отчетов в reports/invoice_payment_report.xml
+REPORT_CACHE_PREFIX = 'L3-'
+REPORT_CACHE_MAX_SIZE_PARAM = 'l3.report_cache.max_size_mb'
+REPORT_CACHE_DEFAULT_MAX_SIZE_MB = 512
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    def _retrieve_attachment(self, record):
+        """Отмечаем использование закэшированного PDF для вытеснения по LRU"""
+        attachment = super()._retrieve_attachment(record)
+        if attachment and attachment.name.startswith(REPORT_CACHE_PREFIX):
+            # write_date закэшированного PDF служит временем последнего обращения
+            self.env.cr.execute(
+                "UPDATE ir_attachment SET write_date = (now() at time zone 'UTC') WHERE id = %s",
+                [attachment.id],
+            )
+            attachment.invalidate_recordset(['write_date'])
+        return attachment
+
+    @api.model
+    def _gc_report_cache(self):
+        """Очистка кэша PDF отчетов L3 (cron)
+
+        - удаляются устаревшие версии (другой write_date заказа) и PDF
+          заказов, которые больше не подтверждены;
+        - остальные удаляются от давно не использованных, пока общий размер
+          больше l3.report_cache.max_size_mb.
+        """
+        attachments = self.env['ir.attachment'].sudo().search_fetch([
+            ('res_model', '=', 'sale.order'),
+            ('name', '=like', REPORT_CACHE_PREFIX + '%'),
+        ], ['name', 'res_id', 'file_size', 'write_date'], order='write_date desc, id desc')
+        if not attachments:
+            return
+
+        confirmed_order_ids = set(self.env['sale.order'].sudo().search([
+            ('id', 'in', list(set(attachments.mapped('res_id')))),
+            ('state', '=', 'sale'),
+        ]).ids)
+        versions = defaultdict(lambda: self.env['ir.attachment'])
+        to_delete = self.env['ir.attachment']
+        for attachment in attachments:
+            if attachment.res_id not in confirmed_order_ids:
+                to_delete |= attachment
+            else:
+                # Ключ без write_date: отчет, заказ и язык
+                versions[attachment.name.rsplit('-', 1)[0]] |= attachment
+        for key_attachments in versions.values():
+            # write_date в имени имеет фиксированную ширину: актуальна последняя версия
+            latest = max(key_attachments, key=lambda a: a.name)
+            to_delete |= key_attachments - latest
+
+        max_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            REPORT_CACHE_MAX_SIZE_PARAM, REPORT_CACHE_DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+        total_size = 0
+        for attachment in attachments - to_delete:
+            total_size += attachment.file_size
+            if total_size > max_size:
+                to_delete |= attachment
+
+        if to_delete:
+            _logger.info("Report cache: removing %s cached PDF(s)", len(to_delete))
+            to_delete.unlink()
@@ -1,38 +1,99 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+import hashlib
+import json
+from urllib.parse import urlparse
+
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import AccessError, ValidationError
+
+# Ключ параметра -> (ключ настройки, значение по умолчанию)
+DATE_PANEL_PARAMS = {
+    'l3.date_panel.enabled': ('enabled', 'True'),
+    'l3.date_panel.format': ('format', 'short'),
+    'l3.date_panel.timezone': ('timezone', 'Europe/Moscow'),
+    'l3.date_panel.link_url': ('link_url', 'https://www.timeanddate.com/worldclock/russia/moscow'),
+}
+DATE_PANEL_DEFAULT_LINK_URL = DATE_PANEL_PARAMS['l3.date_panel.link_url'][1]
+
+
+def is_http_url(url):
+    """Только абсолютные http(s) ссылки: панель открывает их через window.open"""
+    parsed = urlparse(url or '')
+    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
 
 
 class IrConfigParameter(models.Model):
     _inherit = 'ir.config_parameter'
-    
+
     @api.model
-    def get_date_panel_settings(self):
-        """Получить настройки панели даты"""
-        return {
-            'enabled': self.sudo().get_param('l3.date_panel.enabled', 'True') == 'True',
-            'format': self.sudo().get_param('l3.date_panel.format', 'short'),
-            'timezone': self.sudo().get_param('l3.date_panel.timezone', 'Europe/Moscow'),
-            'link_url': self.sudo().get_param('l3.date_panel.link_url', 'https://www.timeanddate.com/worldclock/russia/moscow'),
+    def get_date_panel_settings(self, version=None):
+        """Получить настройки панели даты
+
+        Если клиент передает version, совпадающую с текущей, возвращается
+        только {'version': ..., 'unchanged': True}.
+        """
+        settings = self._get_date_panel_settings()
+        if version and version == settings['version']:
+            return {'version': version, 'unchanged': True}
+        return dict(settings)
+
+    @api.model
+    @tools.ormcache()
+    def _get_date_panel_settings(self):
+        """Все параметры l3.date_panel.* одним запросом
+
+        Кэш сбрасывается set_param (и значит всеми set_date_panel_*), который
+        очищает кэш реестра.
+        """
+        self.flush_model(['key', 'value'])
+        self.env.cr.execute(
+            "SELECT key, value FROM ir_config_parameter WHERE key = ANY(%s)",
+            [list(DATE_PANEL_PARAMS)],
+        )
+        values = dict(self.env.cr.fetchall())
+        params = {
+            name: values.get(key, default)
+            for key, (name, default) in DATE_PANEL_PARAMS.items()
         }
-    
+        settings = {
+            'enabled': params['enabled'] == 'True',
+            'format': params['format'],
+            'timezone': params['timezone'],
+            # Значение могли записать в обход set_date_panel_link_url
+            'link_url': params['link_url'] if is_http_url(params['link_url']) else DATE_PANEL_DEFAULT_LINK_URL,
+        }
+        settings['version'] = hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+        return settings
+
+    @api.model
+    def _check_date_panel_access(self):
+        """Настройки панели даты меняют только администраторы"""
+        if not self.env.user.has_group('base.group_system'):
+            raise AccessError(_('Only administrators can change the date panel settings.'))
+
     @api.model
     def set_date_panel_enabled(self, enabled):
         """Включить/выключить панель даты"""
-        self.sudo().set_param('l3.date_panel.enabled', str(enabled))
-    
+        self._check_date_panel_access()
+        self.set_param('l3.date_panel.enabled', str(bool(enabled)))
+
     @api.model
     def set_date_panel_format(self, format_type):
         """Установить формат отображения даты"""
-        self.sudo().set_param('l3.date_panel.format', format_type)
-    
+        self._check_date_panel_access()
+        self.set_param('l3.date_panel.format', format_type)
+
     @api.model
     def set_date_panel_timezone(self, timezone):
         """Установить часовой пояс"""
-        self.sudo().set_param('l3.date_panel.timezone', timezone)
-    
+        self._check_date_panel_access()
+        self.set_param('l3.date_panel.timezone', timezone)
+
     @api.model
     def set_date_panel_link_url(self, url):
-        """Установить URL для ссылки при клике"""
-        self.sudo().set_param('l3.date_panel.link_url', url)
-
+        """Установить URL для ссылки при клике (только http/https)"""
+        self._check_date_panel_access()
+        if not is_http_url(url):
+            raise ValidationError(_('The date panel link must be an http(s) URL.'))
+        self.set_param('l3.date_panel.link_url', url)
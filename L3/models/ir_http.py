@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    def session_info(self):
+        """Передаем настройки панели даты веб-клиенту вместе с сессией"""
+        result = super().session_info()
+        if self.env.user._is_internal():
+            result['l3_date_panel'] = dict(self.env['ir.config_parameter']._get_date_panel_settings())
+        return result
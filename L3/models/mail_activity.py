@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api
 
 
@@ -13,46 +15,83 @@ class MailActivity(models.Model):
         help='Salesperson associated with this activity'
     )
 
+    def init(self):
+        super().init()
+        # Индекс для представлений "активности моей команды" по продавцу и сроку
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS mail_activity_salesperson_deadline_index
+                ON mail_activity (salesperson_id, date_deadline)
+             WHERE salesperson_id IS NOT NULL
+        """)
+
+    @api.model
+    def _sync_salesperson_for_orders(self, order_ids, user_id):
+        """Обновляет продавца в активностях заказов и их линий одним SQL запросом"""
+        if not order_ids:
+            return
+        self.flush_model(['res_model', 'res_id', 'salesperson_id'])
+        self.env['sale.order.line'].flush_model(['order_id'])
+        self.env.cr.execute("""
+            UPDATE mail_activity
+               SET salesperson_id = %(user_id)s
+             WHERE salesperson_id IS DISTINCT FROM %(user_id)s
+               AND (
+                    (res_model = 'sale.order' AND res_id = ANY(%(order_ids)s))
+                    OR (res_model = 'sale.order.line' AND res_id IN (
+                        SELECT id FROM sale_order_line WHERE order_id = ANY(%(order_ids)s)
+                    ))
+               )
+        """, {'user_id': user_id or None, 'order_ids': list(order_ids)})
+        if self.env.cr.rowcount:
+            self.invalidate_model(['salesperson_id'])
+
     @api.model_create_multi
     def create(self, vals_list):
         """Переопределяем создание активности для автоматического заполнения salesperson"""
+        # Группируем записи по модели, чтобы прочитать продавцов одним запросом на модель
+        res_ids_by_model = defaultdict(set)
         for vals in vals_list:
             # Если активность создается для sale.order или sale.order.line
-            if 'res_model' in vals and vals['res_model'] in ['sale.order', 'sale.order.line']:
-                # Получаем запись, для которой создается активность
-                res_id = vals.get('res_id')
-                if res_id:
-                    record = self.env[vals['res_model']].browse(res_id)
-                    
-                    # Если это sale.order, берем user_id
-                    if vals['res_model'] == 'sale.order' and hasattr(record, 'user_id') and record.user_id:
-                        vals['salesperson_id'] = record.user_id.id
-                    
-                    # Если это sale.order.line, берем user_id из order_id
-                    elif vals['res_model'] == 'sale.order.line' and hasattr(record, 'order_id') and record.order_id.user_id:
-                        vals['salesperson_id'] = record.order_id.user_id.id
-        
+            if vals.get('res_model') in ('sale.order', 'sale.order.line') and vals.get('res_id'):
+                res_ids_by_model[vals['res_model']].add(vals['res_id'])
+
+        salespersons_by_model = {
+            res_model: self._get_salespersons_from_records(res_model, res_ids)
+            for res_model, res_ids in res_ids_by_model.items()
+        }
+        for vals in vals_list:
+            salesperson_id = salespersons_by_model.get(vals.get('res_model'), {}).get(vals.get('res_id'))
+            if salesperson_id:
+                vals['salesperson_id'] = salesperson_id
+
         return super().create(vals_list)
 
+    @api.model
+    def _get_salespersons_from_records(self, res_model, res_ids):
+        """Получаем продавцов для записей одной модели: {res_id: id продавца}"""
+        if res_model not in ('sale.order', 'sale.order.line') or not res_ids:
+            return {}
+
+        records = self.env[res_model].browse(list(res_ids)).exists()
+
+        # Если это sale.order, берем user_id
+        if res_model == 'sale.order':
+            salespersons = {record.id: record.user_id.id for record in records}
+
+        # Если это sale.order.line, берем user_id из order_id
+        else:
+            salespersons = {record.id: record.order_id.user_id.id for record in records}
+
+        return {res_id: user_id for res_id, user_id in salespersons.items() if user_id}
+
     @api.model
     def _get_salesperson_from_record(self, res_model, res_id):
         """Получаем продавца из записи"""
         if not res_model or not res_id:
             return False
-            
+
         try:
-            record = self.env[res_model].browse(res_id)
-            
-            # Если это sale.order, берем user_id
-            if res_model == 'sale.order' and hasattr(record, 'user_id') and record.user_id:
-                return record.user_id.id
-            
-            # Если это sale.order.line, берем user_id из order_id
-            elif res_model == 'sale.order.line' and hasattr(record, 'order_id') and record.order_id.user_id:
-                return record.order_id.user_id.id
-                
+            return self._get_salespersons_from_records(res_model, [res_id]).get(res_id, False)
         except Exception:
             # Игнорируем ошибки при получении записи
-            pass
-            
-        return False
\ No newline at end of file
+            return False
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools.sql import index_exists
 
 
 class ResPartner(models.Model):
@@ -20,6 +23,26 @@ class ResPartner(models.Model):
         help='Shows if this contact is the primary contact for the company'
     )
 
+    primary_contact_id = fields.Many2one(
+        'res.partner',
+        string='Primary Contact Person',
+        compute='_compute_primary_contact_id',
+        store=True,
+        index='btree_not_null',
+        help='Primary contact of this company'
+    )
+
+    @api.depends('child_ids.is_primary', 'child_ids.active')
+    def _compute_primary_contact_id(self):
+        # Архивный основной контакт не считается основным, как и в уникальном индексе
+        primaries = self.search([
+            ('parent_id', 'in', self._origin.ids),
+            ('is_primary', '=', True)
+        ])
+        primary_by_parent = {primary.parent_id.id: primary for primary in primaries}
+        for partner in self:
+            partner.primary_contact_id = primary_by_parent.get(partner._origin.id, False)
+
     @api.depends('is_primary', 'parent_id')
     def _compute_primary_contact(self):
         for partner in self:
@@ -30,48 +53,128 @@ class ResPartner(models.Model):
             else:
                 partner.primary_contact = ""
 
-    @api.constrains('is_primary', 'parent_id')
+    def init(self):
+        super().init()
+        # База данных гарантирует не более одного активного основного контакта на компанию.
+        # Существующие дубликаты убирает миграция 18.0.1.2.0
+        if not index_exists(self.env.cr, 'res_partner_unique_primary_contact'):
+            self.env.cr.execute("""
+                CREATE UNIQUE INDEX res_partner_unique_primary_contact
+                    ON res_partner (parent_id)
+                 WHERE is_primary AND active AND parent_id IS NOT NULL
+            """)
+
+    def _raise_primary_contact_conflict(self, existing_primary, parent):
+        raise ValidationError(
+            _('Только один основной контакт разрешен для компании. '
+              'Контакт "%s" уже помечен как основной для "%s".') %
+            (existing_primary.name, parent.name)
+        )
+
+    @api.constrains('is_primary', 'parent_id', 'active')
     def _check_primary_contact(self):
-        for partner in self:
-            if partner.is_primary and partner.parent_id:
-                existing_primary = self.search([
-                    ('parent_id', '=', partner.parent_id.id),
-                    ('is_primary', '=', True),
-                    ('id', '!=', partner.id)
-                ])
-                if existing_primary:
-                    raise ValidationError(
-                        _('Только один основной контакт разрешен для компании. '
-                          'Контакт "%s" уже помечен как основной для "%s".') %
-                        (existing_primary[0].name, partner.parent_id.name)
-                    )
+        # Архивные контакты не учитываются, как и в уникальном индексе
+        partners = self.filtered(lambda p: p.is_primary and p.parent_id and p.active)
+        if not partners:
+            return
+        primaries_by_parent = defaultdict(lambda: self.env['res.partner'])
+        for primary in self.search([
+            ('parent_id', 'in', partners.parent_id.ids),
+            ('is_primary', '=', True)
+        ]):
+            primaries_by_parent[primary.parent_id] |= primary
+        for partner in partners:
+            existing_primary = primaries_by_parent[partner.parent_id] - partner
+            if existing_primary:
+                self._raise_primary_contact_conflict(existing_primary[0], partner.parent_id)
 
     @api.model_create_multi
     def create(self, vals_list):
-        partners = super().create(vals_list)
-        for partner in partners:
-            if partner.is_primary and partner.parent_id:
-                self._unset_other_primary_contacts(partner.parent_id.id, partner.id)
-        return partners
+        # Если в пакете несколько основных контактов одной компании, основным остается последний
+        primary_vals_by_parent = {}
+        default_parent_id = self.env.context.get('default_parent_id')
+        for vals in vals_list:
+            parent_id = vals.get('parent_id', default_parent_id)
+            if vals.get('is_primary') and vals.get('active', True) and parent_id:
+                previous_vals = primary_vals_by_parent.get(parent_id)
+                if previous_vals:
+                    previous_vals['is_primary'] = False
+                primary_vals_by_parent[parent_id] = vals
+        if primary_vals_by_parent:
+            self._unset_primary_contacts_of_parents(list(primary_vals_by_parent))
+        return super().create(vals_list)
 
     def write(self, vals):
-        for partner in self:
-            if 'is_primary' in vals and partner.parent_id:
-                if vals['is_primary']:
-                    self._unset_other_primary_contacts(partner.parent_id.id, partner.id)
+        if vals.get('is_primary'):
+            # Архивные основные контакты не мешают остальным, их не учитываем
+            active_partners = self.filtered(lambda p: vals.get('active', p.active))
+            if 'parent_id' in vals:
+                partners = active_partners if vals['parent_id'] else self.browse()
+                parents = self.browse(vals['parent_id']) if partners else self.browse()
+            else:
+                partners = active_partners.filtered('parent_id')
+                parents = partners.parent_id
+            if len(parents) < len(partners):
+                # Несколько контактов одной компании стали бы основными одновременно
+                seen = {}
+                for partner in partners:
+                    parent = parents if 'parent_id' in vals else partner.parent_id
+                    if parent in seen:
+                        self._raise_primary_contact_conflict(seen[parent], parent)
+                    seen[parent] = partner
+            if parents:
+                self._unset_primary_contacts_of_parents(parents.ids, exclude_ids=partners.ids)
+        elif 'is_primary' not in vals and (vals.get('parent_id') or vals.get('active')):
+            # Основной контакт переносится в другую компанию или восстанавливается из архива:
+            # как и раньше в _check_primary_contact, не отнимаем статус у основного контакта
+            # компании, а сообщаем о конфликте до записи, не дожидаясь ошибки уникального индекса
+            def becomes_active_primary(partner):
+                if not partner.is_primary:
+                    return False
+                active = vals.get('active', partner.active)
+                return active and (vals.get('parent_id') or not partner.active)
+            self.filtered(becomes_active_primary)._check_incoming_primary_contacts(vals.get('parent_id'))
         return super().write(vals)
 
-    def _unset_other_primary_contacts(self, parent_id, exclude_id=None):
+    def _check_incoming_primary_contacts(self, parent_id=None):
+        """Конфликт, если эти контакты станут активными основными в компании parent_id
+        (или в своих компаниях), где уже есть другой активный основной контакт"""
+        incoming_by_parent = {}
+        for partner in self:
+            parent = self.browse(parent_id) if parent_id else partner.parent_id
+            if not parent:
+                continue
+            if parent in incoming_by_parent:
+                self._raise_primary_contact_conflict(incoming_by_parent[parent], parent)
+            incoming_by_parent[parent] = partner
+        if not incoming_by_parent:
+            return
+        existing_primary = self.search([
+            ('parent_id', 'in', [parent.id for parent in incoming_by_parent]),
+            ('is_primary', '=', True),
+            ('id', 'not in', self.ids),
+        ], limit=1)
+        if existing_primary:
+            self._raise_primary_contact_conflict(existing_primary, existing_primary.parent_id)
+
+    @api.model
+    def _unset_primary_contacts_of_parents(self, parent_ids, exclude_ids=None):
+        """Снимает статус основного контакта у контактов компаний parent_ids одним запросом"""
         domain = [
-            ('parent_id', '=', parent_id),
+            ('parent_id', 'in', parent_ids),
             ('is_primary', '=', True)
         ]
-        if exclude_id:
-            domain.append(('id', '!=', exclude_id))
+        if exclude_ids:
+            domain.append(('id', 'not in', exclude_ids))
 
         other_primary_contacts = self.search(domain)
         if other_primary_contacts:
             other_primary_contacts.write({'is_primary': False})
+            # Сбрасываем сразу, чтобы не нарушить уникальный индекс при записи нового основного контакта
+            other_primary_contacts.flush_recordset(['is_primary'])
+
+    def _unset_other_primary_contacts(self, parent_id, exclude_id=None):
+        self._unset_primary_contacts_of_parents([parent_id], exclude_ids=[exclude_id] if exclude_id else None)
 
     def unlink(self):
         for partner in self:
@@ -96,9 +199,9 @@ class ResPartner(models.Model):
     def get_primary_contact(self):
         self.ensure_one()
         if self.is_company:
-            return self.search(self._get_primary_contact_domain(self.id), limit=1)
+            return self.primary_contact_id
         elif self.parent_id:
-            return self.search(self._get_primary_contact_domain(self.parent_id.id), limit=1)
+            return self.parent_id.primary_contact_id
         return self.env['res.partner']
 
     def action_save_contact(self):
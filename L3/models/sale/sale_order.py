@@ -1,15 +1,56 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+import logging
+from collections import Counter, defaultdict
+
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError
 
+_logger = logging.getLogger(__name__)
+
+# Size of one page of the selected/available product lists
+PRODUCTS_PAGE_SIZE = 80
+
+
+class ProductExclusionIndex:
+    """Products and product templates used by the lines of one sale order.
+
+    A per-call snapshot: how many lines use each product/template, plus the
+    (product, template) pair of every line so that one line can be left out of
+    the result without rescanning the order.
+    """
+
+    def __init__(self, lines):
+        self._line_keys = {}
+        self._product_counts = Counter()
+        self._template_counts = Counter()
+        for line in lines:
+            product_id, template_id = line.product_id.id, line.product_template_id.id
+            self._line_keys[line.id] = (product_id, template_id)
+            if product_id:
+                self._product_counts[product_id] += 1
+            if template_id:
+                self._template_counts[template_id] += 1
+
+    def product_ids(self, exclude_line_id=None):
+        return self._used_ids(self._product_counts, 0, exclude_line_id)
+
+    def template_ids(self, exclude_line_id=None):
+        return self._used_ids(self._template_counts, 1, exclude_line_id)
+
+    def _used_ids(self, counts, position, exclude_line_id):
+        # NewId of a line edited in the form is falsy, compare with None
+        keys = self._line_keys.get(exclude_line_id) if exclude_line_id is not None else None
+        own_key = keys and keys[position]
+        return [key for key, count in counts.items() if key != own_key or count > 1]
+
 
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
 
     # Keep default confirmation flow from `sale`/`sale_stock`.
 
-    delivery_count = fields.Integer(string='Delivery Count', compute='_compute_delivery_count')
+    delivery_count = fields.Integer(string='Delivery Count', compute='_compute_delivery_count', store=True)
     
     # Computed field to get used product template IDs
     used_product_template_ids = fields.Many2many(
@@ -19,6 +60,25 @@ class SaleOrder(models.Model):
         help='Product templates already selected in this order'
     )
 
+    express_procurement_group_id = fields.Many2one(
+        'procurement.group',
+        string='Express Procurement Group',
+        copy=False,
+        readonly=True,
+        help='Procurement group used for the express lines of this order'
+    )
+
+    def _get_product_exclusion_index(self):
+        """Return the index of products/templates used by the lines of this order.
+
+        The index is built from the current lines on every call and is not kept
+        across calls. Callers needing it for many lines (e.g.
+        sale.order.line._compute_available_product_domain) keep it locally for
+        the duration of one call.
+        """
+        self.ensure_one()
+        return ProductExclusionIndex(self.order_line.filtered(lambda l: not l.display_type))
+
     @api.model
     def _get_available_products_domain(self):
         """Return domain to exclude already selected products from dropdown"""
@@ -33,7 +93,7 @@ class SaleOrder(models.Model):
             return []
         
         # Get all already selected product IDs in this order
-        selected_product_ids = order.order_line.mapped('product_id.id')
+        selected_product_ids = order._get_product_exclusion_index().product_ids()
         
         # Exclude already selected products from dropdown
         if selected_product_ids:
@@ -44,15 +104,18 @@ class SaleOrder(models.Model):
     def _compute_used_product_template_ids(self):
         """Compute used product template IDs from order lines"""
         for order in self:
-            used_templates = order.order_line.filtered('product_template_id').mapped('product_template_id')
-            order.used_product_template_ids = used_templates
+            order.used_product_template_ids = order._get_product_exclusion_index().template_ids()
 
+    @api.depends('picking_ids.state')
     def _compute_delivery_count(self):
+        """Count non-cancelled deliveries of all orders with one grouped query"""
+        delivery_data = self.env['stock.picking']._read_group([
+            ('sale_id', 'in', self._origin.ids),
+            ('state', 'not in', ('cancel',))
+        ], ['sale_id'], ['__count'])
+        counts = {sale_order.id: count for sale_order, count in delivery_data}
         for order in self:
-            order.delivery_count = self.env['stock.picking'].search_count([
-                ('sale_id', '=', order.id),
-                ('state', 'not in', ('cancel',))
-            ])
+            order.delivery_count = counts.get(order._origin.id, 0)
 
     def action_view_delivery_custom(self):
         self.ensure_one()
@@ -71,130 +134,222 @@ class SaleOrder(models.Model):
         - Confirm all unfinished/uncancelled deliveries
         - Try to reserve goods (action_assign) so that the Delivery button
           immediately shows readiness
+
+        The whole recordset is processed at once: pickings and moves are
+        created with one ``create`` per model and moves are regrouped with
+        one ``write`` per target picking.
         """
         result = super()._action_confirm()
-        for order in self:
-            # Force creation of movements/pickings according to warehouse rules
+        # Force creation of movements/pickings according to warehouse rules
+        self._launch_stock_rules()
+        open_pickings = self.picking_ids.filtered(lambda p: p.state not in ('done', 'cancel'))
+        # If for some reason deliveries haven't been created (non-standard configuration),
+        # create them manually and put the corresponding lines.
+        orders_without_pickings = self.filtered(lambda o: not (o.picking_ids & open_pickings))
+        pickings = open_pickings | orders_without_pickings._create_delivery_pickings()
+        if pickings:
+            # Transfer from draft/waiting to confirmed/ready
+            pickings.action_confirm()
+            # Try to reserve (if sufficient stock)
             try:
-                order.order_line._action_launch_stock_rule()
+                pickings.action_assign()
             except Exception:
+                # Reservation may not work due to lack of stock - this is not critical
                 pass
-            pickings = order.picking_ids.filtered(lambda p: p.state not in ('done', 'cancel'))
-            # If for some reason deliveries haven't been created (non-standard configuration),
-            # create them manually and put the corresponding lines.
-            if not pickings:
-                regular_lines = order.order_line.filtered(lambda l: not l.display_type and l.product_id and not l.express_delivery)
-                express_lines = order.order_line.filtered(lambda l: not l.display_type and l.product_id and l.express_delivery)
-
-                regular_picking = express_picking = False
-                if regular_lines:
-                    regular_picking = order._create_regular_picking()
-                    for line in regular_lines:
-                        order._create_move_for_line(line, regular_picking)
-                if express_lines:
-                    express_picking = order._create_express_picking()
-                    for line in express_lines:
-                        order._create_move_for_line(line, express_picking)
-
-                pickings = self.env['stock.picking'].browse([p.id for p in [regular_picking, express_picking] if p])
-            if pickings:
-                # Transfer from draft/waiting to confirmed/ready
-                pickings.action_confirm()
-                # Try to reserve (if sufficient stock)
-                try:
-                    pickings.action_assign()
-                except Exception:
-                    # Reservation may not work due to lack of stock - this is not critical
-                    pass
-
-            # Additionally group deliveries: one for express, one for regular
-            # This is needed in case standard rules distributed goods across different movements/deliveries
-            regroup_pickings = order.picking_ids.filtered(lambda p: p.state not in ('done', 'cancel') and p.picking_type_code == 'outgoing')
-            if regroup_pickings:
+
+        # Additionally group deliveries: one for express, one for regular
+        # This is needed in case standard rules distributed goods across different movements/deliveries
+        self._regroup_delivery_pickings()
+        # Update computed fields and references so Delivery button appears immediately
+        try:
+            self.invalidate_recordset()
+            self.flush(['picking_ids', 'state'])
+        except Exception:
+            pass
+        return result
+
+    def _launch_stock_rules(self):
+        """Run the stock rules of all orders at once.
+
+        If the batch fails, the orders are retried one by one so that a single
+        failing order only skips its own stock rules, as before batching.
+        """
+        try:
+            with self.env.cr.savepoint():
+                self.order_line._action_launch_stock_rule()
+            return
+        except Exception:
+            if len(self) == 1:
+                _logger.warning("Stock rules failed for order %s", self.name, exc_info=True)
+                return
+        for order in self:
+            try:
+                with self.env.cr.savepoint():
+                    order.order_line._action_launch_stock_rule()
+            except Exception:
+                _logger.warning("Stock rules failed for order %s", order.name, exc_info=True)
+
+    def _get_express_procurement_groups(self):
+        """Return the express procurement groups of the orders, creating missing ones in bulk.
+
+        Groups created before the express_procurement_group_id link existed are
+        reused by name. The orders are locked first so that concurrent
+        confirmations of the same order cannot create a second group.
+        """
+        orders = self.filtered(lambda o: not o.express_procurement_group_id)
+        if orders:
+            self.env.cr.execute("SELECT id FROM sale_order WHERE id = ANY(%s) FOR UPDATE", [orders.ids])
+            orders.invalidate_recordset(['express_procurement_group_id'])
+            orders = orders.filtered(lambda o: not o.express_procurement_group_id)
+        if orders:
+            group_names = {order: f"{order.name} - Express" for order in orders}
+            existing_groups = {
+                (group.sale_id.id, group.name): group
+                for group in self.env['procurement.group'].search([
+                    ('sale_id', 'in', orders.ids),
+                    ('name', 'in', list(group_names.values())),
+                ])
+            }
+            orders_to_create = self.env['sale.order']
+            for order in orders:
+                group = existing_groups.get((order.id, group_names[order]))
+                if group:
+                    order.express_procurement_group_id = group
+                else:
+                    orders_to_create |= order
+            new_groups = self.env['procurement.group'].create([{
+                'name': group_names[order],
+                'move_type': order.picking_policy,
+                'sale_id': order.id,
+                'partner_id': order.partner_shipping_id.id,
+            } for order in orders_to_create])
+            for order, group in zip(orders_to_create, new_groups):
+                order.express_procurement_group_id = group
+        return self.express_procurement_group_id
+
+    def _get_delivery_lines(self):
+        """Return (regular lines, express lines) of the order that need a delivery"""
+        self.ensure_one()
+        lines = self.order_line.filtered(lambda l: not l.display_type and l.product_id)
+        return lines.filtered(lambda l: not l.express_delivery), lines.filtered('express_delivery')
+
+    def _create_delivery_pickings(self):
+        """Create regular/express deliveries with their moves for all orders at once"""
+        picking_vals_list = []
+        picking_lines = []
+        for order in self:
+            regular_lines, express_lines = order._get_delivery_lines()
+            if regular_lines:
+                picking_vals_list.append(order._prepare_regular_picking_vals())
+                picking_lines.append(regular_lines)
+            if express_lines:
+                picking_vals_list.append(order._prepare_express_picking_vals())
+                picking_lines.append(express_lines)
+        if not picking_vals_list:
+            return self.env['stock.picking']
+
+        pickings = self.env['stock.picking'].create(picking_vals_list)
+        self.env['stock.move'].create([
+            line.order_id._prepare_move_vals_for_line(line, picking)
+            for picking, lines in zip(pickings, picking_lines)
+            for line in lines
+        ])
+        return pickings
+
+    def _regroup_delivery_pickings(self):
+        """Move the moves of open outgoing deliveries to one regular and one express delivery per order"""
+        regroup_pickings_by_order = defaultdict(lambda: self.env['stock.picking'])
+        for picking in self.env['stock.picking'].search([
+            ('sale_id', 'in', self.ids),
+            ('state', 'not in', ('done', 'cancel')),
+            ('picking_type_code', '=', 'outgoing'),
+        ]):
+            regroup_pickings_by_order[picking.sale_id] |= picking
+
+        targets = {}
+        missing_target_keys = []
+        missing_target_vals = []
+        for order, regroup_pickings in regroup_pickings_by_order.items():
+            regular_lines, express_lines = order._get_delivery_lines()
+            for is_express, role, lines in ((False, 'regular', regular_lines), (True, 'express', express_lines)):
                 # Find/create target deliveries
-                regular_target = regroup_pickings.filtered(lambda p: (p.note or '').lower().strip() == _('Regular Delivery').lower().strip())[:1]
-                express_target = regroup_pickings.filtered(lambda p: (p.note or '').lower().strip() == _('Express Delivery').lower().strip())[:1]
-
-                if not regular_target:
-                    # Create empty regular delivery if needed
-                    regular_lines_exist = any(l for l in order.order_line.filtered(lambda l: not l.display_type and l.product_id and not l.express_delivery))
-                    if regular_lines_exist:
-                        regular_target = order._create_regular_picking()
-                if not express_target:
-                    # Create empty express delivery if needed
-                    express_lines_exist = any(l for l in order.order_line.filtered(lambda l: not l.display_type and l.product_id and l.express_delivery))
-                    if express_lines_exist:
-                        express_target = order._create_express_picking()
-
-                # Move movements to corresponding target deliveries
-                for picking in regroup_pickings:
-                    for move in picking.move_ids:
-                        is_express = bool(getattr(move.sale_line_id, 'express_delivery', False))
-                        target_picking = express_target if is_express else regular_target
-                        if target_picking and move.picking_id.id != (target_picking.id if hasattr(target_picking, 'id') else target_picking):
-                            move.write({'picking_id': target_picking.id})
-
-                # Cancel empty deliveries so they don't count in delivery count
-                for picking in regroup_pickings:
-                    if not picking.move_ids:
-                        try:
-                            if picking.state not in ('done', 'cancel'):
-                                picking.action_cancel()
-                        except Exception:
-                            # If can't cancel - hide from count through state
-                            pass
-            # Update computed fields and references so Delivery button appears immediately
+                target = regroup_pickings.filtered(lambda p: p.delivery_role == role)[:1]
+                if target:
+                    targets[order.id, is_express] = target
+                elif lines:
+                    # Create empty delivery if needed
+                    missing_target_keys.append((order.id, is_express))
+                    missing_target_vals.append(
+                        order._prepare_express_picking_vals() if is_express else order._prepare_regular_picking_vals()
+                    )
+        if not regroup_pickings_by_order:
+            return
+        if missing_target_vals:
+            new_targets = self.env['stock.picking'].create(missing_target_vals)
+            targets.update(zip(missing_target_keys, new_targets))
+
+        # Move movements to corresponding target deliveries
+        move_ids_by_target = defaultdict(list)
+        all_regroup_pickings = self.env['stock.picking']
+        for order, regroup_pickings in regroup_pickings_by_order.items():
+            all_regroup_pickings |= regroup_pickings
+            for move in regroup_pickings.move_ids:
+                target = targets.get((order.id, bool(move.sale_line_id.express_delivery)))
+                if target and move.picking_id != target:
+                    move_ids_by_target[target].append(move.id)
+        for target, move_ids in move_ids_by_target.items():
+            self.env['stock.move'].browse(move_ids).write({'picking_id': target.id})
+
+        # Cancel empty deliveries so they don't count in delivery count
+        empty_pickings = all_regroup_pickings.filtered(lambda p: not p.move_ids and p.state not in ('done', 'cancel'))
+        if empty_pickings:
             try:
-                order.invalidate_recordset()
-                order.flush(['picking_ids', 'state'])
+                empty_pickings.action_cancel()
             except Exception:
+                # If can't cancel - hide from count through state
                 pass
-        return result
 
     # --- Helper methods for forced creation of deliveries ---
     def _get_outgoing_picking_type(self):
         self.ensure_one()
-        picking_type = self.env['stock.picking.type'].search([
-            ('code', '=', 'outgoing'),
-            ('warehouse_id', '=', self.warehouse_id.id)
-        ], limit=1)
-        if not picking_type:
+        picking_type_id = self._get_outgoing_picking_type_id(self.company_id.id, self.warehouse_id.id)
+        if not picking_type_id:
             raise UserError(_('No outgoing picking type found for this warehouse'))
-        return picking_type
+        return self.env['stock.picking.type'].browse(picking_type_id)
 
-    def _create_regular_picking(self):
-        self.ensure_one()
-        picking_type = self._get_outgoing_picking_type()
-        vals = {
-            'partner_id': self.partner_shipping_id.id or self.partner_id.id,
-            'picking_type_id': picking_type.id,
-            'location_id': picking_type.default_location_src_id.id,
-            'location_dest_id': picking_type.default_location_dest_id.id,
-            'origin': self.name,
-            'sale_id': self.id,
-            'note': _('Regular Delivery'),
-        }
-        return self.env['stock.picking'].create(vals)
+    @api.model
+    @tools.ormcache('company_id', 'warehouse_id')
+    def _get_outgoing_picking_type_id(self, company_id, warehouse_id):
+        """Outgoing picking type of the warehouse, cached until picking types change"""
+        return self.env['stock.picking.type'].sudo().search([
+            ('code', '=', 'outgoing'),
+            ('company_id', '=', company_id),
+            ('warehouse_id', '=', warehouse_id)
+        ], limit=1).id
 
-    def _create_express_picking(self):
+    def _prepare_delivery_picking_vals(self, delivery_role, note):
         self.ensure_one()
         picking_type = self._get_outgoing_picking_type()
-        vals = {
+        return {
             'partner_id': self.partner_shipping_id.id or self.partner_id.id,
             'picking_type_id': picking_type.id,
             'location_id': picking_type.default_location_src_id.id,
             'location_dest_id': picking_type.default_location_dest_id.id,
             'origin': self.name,
             'sale_id': self.id,
-            'note': _('Express Delivery'),
+            'note': note,
+            'delivery_role': delivery_role,
         }
-        return self.env['stock.picking'].create(vals)
 
-    def _create_move_for_line(self, line, picking):
+    def _prepare_regular_picking_vals(self):
+        return self._prepare_delivery_picking_vals('regular', _('Regular Delivery'))
+
+    def _prepare_express_picking_vals(self):
+        return self._prepare_delivery_picking_vals('express', _('Express Delivery'))
+
+    def _prepare_move_vals_for_line(self, line, picking):
         self.ensure_one()
-        if not picking:
-            return False
-        move_vals = {
+        return {
             'name': line.name,
             'product_id': line.product_id.id,
             'product_uom_qty': line.product_uom_qty,
@@ -207,7 +362,6 @@ class SaleOrder(models.Model):
             'origin': self.name,
             'description_picking': line.name,
         }
-        return self.env['stock.move'].create(move_vals)
 
     @api.model
     def _update_product_domain_on_line_change(self):
@@ -218,103 +372,25 @@ class SaleOrder(models.Model):
 
     @api.onchange('order_line')
     def _onchange_order_line_update_domain(self):
-        """Update product domain when order lines change - INSTANT REMOVAL"""
-        # Get all selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Force onchange for all order lines to update their domains IMMEDIATELY
-        for line in self.order_line:
-            if hasattr(line, '_onchange_product_id_check_and_update_domain'):
-                line._onchange_product_id_check_and_update_domain()
-            if hasattr(line, '_force_update_product_domain'):
-                line._force_update_product_domain()
-        
-        # Return domain to exclude already selected products for all lines
-        domain = [('id', 'not in', selected_product_ids)] if selected_product_ids else []
-        
-        return {
-            'domain': {
-                'order_line': {
-                    'product_id': domain
-                }
-            }
-        }
-
-    @api.onchange('partner_id', 'partner_invoice_id', 'partner_shipping_id')
-    def _onchange_partner_update_domain(self):
-        """Update product domain when partner changes - INSTANT REMOVAL"""
-        # Get all selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Force onchange for all order lines to update their domains IMMEDIATELY
-        for line in self.order_line:
-            if hasattr(line, '_onchange_product_id_check_and_update_domain'):
-                line._onchange_product_id_check_and_update_domain()
-            if hasattr(line, '_force_update_product_domain'):
-                line._force_update_product_domain()
-        
-        # Return domain to exclude already selected products for all lines
-        domain = [('id', 'not in', selected_product_ids)] if selected_product_ids else []
-        
-        return {
-            'domain': {
-                'order_line': {
-                    'product_id': domain
-                }
-            }
-        }
-
-    @api.onchange('company_id', 'warehouse_id', 'pricelist_id')
-    def _onchange_company_warehouse_update_domain(self):
-        """Update product domain when company or warehouse changes - INSTANT REMOVAL"""
-        # Get all selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Force onchange for all order lines to update their domains IMMEDIATELY
-        for line in self.order_line:
-            if hasattr(line, '_onchange_product_id_check_and_update_domain'):
-                line._onchange_product_id_check_and_update_domain()
-            if hasattr(line, '_force_update_product_domain'):
-                line._force_update_product_domain()
-        
-        # Return domain to exclude already selected products for all lines
-        domain = [('id', 'not in', selected_product_ids)] if selected_product_ids else []
-        
-        return {
-            'domain': {
-                'order_line': {
-                    'product_id': domain
-                }
-            }
-        }
+        """Exclude already selected products from the product dropdown of the lines.
 
-    @api.onchange('state', 'date_order', 'validity_date')
-    def _onchange_state_date_update_domain(self):
-        """Update product domain when state or date changes - INSTANT REMOVAL"""
-        # Get all selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Force onchange for all order lines to update their domains IMMEDIATELY
-        for line in self.order_line:
-            if hasattr(line, '_onchange_product_id_check_and_update_domain'):
-                line._onchange_product_id_check_and_update_domain()
-            if hasattr(line, '_force_update_product_domain'):
-                line._force_update_product_domain()
-        
-        # Return domain to exclude already selected products for all lines
-        domain = [('id', 'not in', selected_product_ids)] if selected_product_ids else []
-        
+        The exclusion set only depends on the products of the lines, so this is
+        the single onchange maintaining it: partner, company, warehouse or date
+        edits no longer recompute it or send a domain. The set is computed once
+        per onchange cycle from the order's exclusion index.
+        """
+        selected_product_ids = self._get_product_exclusion_index().product_ids()
         return {
             'domain': {
                 'order_line': {
-                    'product_id': domain
+                    'product_id': [('id', 'not in', selected_product_ids)] if selected_product_ids else []
                 }
             }
         }
     
     def _get_selected_product_ids(self):
         """Get all selected product IDs in this order"""
-        return self.order_line.filtered('product_id').mapped('product_id.id')
+        return self._get_product_exclusion_index().product_ids()
     
     def _update_all_product_domains(self):
         """Update product domains for all order lines"""
@@ -324,12 +400,11 @@ class SaleOrder(models.Model):
 
     def action_get_products_status(self):
         """Action to get status of selected and available products"""
-        selected_products = self._get_selected_products_list()
-        available_products = self._get_available_products_list()
+        self.ensure_one()
+        selected_count = len(self._get_product_exclusion_index().product_ids())
+        available_count = self.env['product.product'].search_count(self._get_available_products_search_domain())
         
-        message = _('Selected: %s products\nAvailable: %s products') % (
-            len(selected_products), len(available_products)
-        )
+        message = _('Selected: %s products\nAvailable: %s products') % (selected_count, available_count)
         
         return {
             'type': 'ir.actions.client',
@@ -366,42 +441,56 @@ class SaleOrder(models.Model):
             }
         }
 
-    def _get_selected_products_list(self):
-        """Get list of selected products with their details"""
-        selected_products = []
-        for line in self.order_line:
-            if line.product_id:
-                selected_products.append({
-                    'id': line.product_id.id,
-                    'name': line.product_id.name,
-                    'default_code': line.product_id.default_code,
-                    'list_price': line.product_id.list_price,
-                    'qty_available': line.product_id.qty_available,
-                })
-        return selected_products
-
-    def _get_available_products_list(self):
-        """Get list of available products (excluding already selected)"""
-        # Get selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Get available products (excluding selected ones)
-        available_products = self.env['product.product'].search([
-            ('id', 'not in', selected_product_ids)
-        ])
-        
-        return [{'id': p.id, 'name': p.name, 'default_code': p.default_code, 
-                'list_price': p.list_price, 'qty_available': p.qty_available} for p in available_products]
+    def _get_selected_products_list(self, offset=0, limit=PRODUCTS_PAGE_SIZE):
+        """Get one page of the selected products with their details"""
+        self.ensure_one()
+        products = self.order_line.product_id
+        products = products[offset:offset + limit] if limit else products[offset:]
+        return self._get_products_list_values(products)
+
+    def _get_available_products_list(self, offset=0, limit=PRODUCTS_PAGE_SIZE):
+        """Get one page of the available products (excluding already selected)"""
+        self.ensure_one()
+        products = self.env['product.product'].search(
+            self._get_available_products_search_domain(), offset=offset, limit=limit
+        )
+        return self._get_products_list_values(products)
+
+    def _get_available_products_search_domain(self):
+        selected_product_ids = self._get_product_exclusion_index().product_ids() if self else []
+        return [('id', 'not in', selected_product_ids)] if selected_product_ids else []
+
+    @api.model
+    def _get_products_list_values(self, products):
+        """Product dicts for the product lists, stock of the page only"""
+        quantities = self._get_products_quantities(products)
+        return [{
+            'id': product.id,
+            'name': product.name,
+            'default_code': product.default_code,
+            'list_price': product.list_price,
+            'qty_available': quantities.get(product.id, 0.0),
+        } for product in products]
+
+    @api.model
+    def _get_products_quantities(self, products):
+        """On-hand quantity in internal locations with one grouped quant query
+
+        Used instead of qty_available, which computes the full stock context
+        for every product.
+        """
+        if not products:
+            return {}
+        quant_data = self.env['stock.quant']._read_group([
+            ('product_id', 'in', products.ids),
+            ('location_id.usage', '=', 'internal'),
+        ], ['product_id'], ['quantity:sum'])
+        return {product.id: quantity for product, quantity in quant_data}
 
     def action_force_update_product_domains(self):
         """Force update domains for all product fields"""
         # Get all selected product IDs
-        selected_product_ids = self.order_line.filtered('product_id').mapped('product_id.id')
-        
-        # Force onchange for all order lines to update their domains
-        for line in self.order_line:
-            if hasattr(line, '_onchange_product_id_check_and_update_domain'):
-                line._onchange_product_id_check_and_update_domain()
+        selected_product_ids = self._get_product_exclusion_index().product_ids()
         
         return {
             'type': 'ir.actions.client',
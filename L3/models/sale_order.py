@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from odoo import api, fields, models, _
+import ast
+from collections import defaultdict
+
+from odoo import api, fields, models, Command, _
 from odoo.exceptions import ValidationError
 
+# Сколько пустых строк (без продукта, не раздел/заметка) может быть в заказе
+MAX_EMPTY_ORDER_LINES = 1
+
 
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
@@ -18,6 +24,13 @@ class SaleOrder(models.Model):
         domain="['|', ('company_id', '=', False), ('company_id', '=', company_id)]"
     )
 
+    # Основной контакт компании клиента (хранится на компании, без поиска)
+    partner_primary_contact_id = fields.Many2one(
+        'res.partner',
+        string='Primary Contact',
+        related='partner_id.commercial_partner_id.primary_contact_id'
+    )
+
     @api.onchange('partner_id')
     def _onchange_partner_id(self):
         """Автоматически заполняем адреса при выборе партнера"""
@@ -40,19 +53,7 @@ class SaleOrder(models.Model):
         if not order.exists():
             return []
         
-       
-        domain = [
-            ('order_id', '=', order_id),
-            ('product_template_id', '!=', False),
-            ('display_type', '=', False)
-        ]
-        if exclude_line_id:
-            domain.append(('id', '!=', exclude_line_id))
-        
-        excluded_lines = self.env['sale.order.line'].search(domain)
-        excluded_ids = excluded_lines.mapped('product_template_id.id')
-        
-        return excluded_ids
+        return order._get_product_exclusion_index().template_ids(exclude_line_id=exclude_line_id)
 
     def get_available_products_domain(self, exclude_line_id=None):
         excluded_ids = self._get_excluded_product_template_ids(self.id, exclude_line_id)
@@ -109,6 +110,33 @@ class SaleOrder(models.Model):
             'res_id': wizard.id,
         }
     
+    @api.model
+    def split_order_lines(self, split_data):
+        """Разделяет линии одного или нескольких заказов без wizard (например, через XML-RPC)
+
+        :param split_data: {id линии заказа: [количество, ...]}
+        :return: список id созданных линий
+        """
+        if not split_data:
+            raise ValidationError(_('Нет линий для разделения'))
+        
+        try:
+            quantities_by_line = {
+                int(line_id): [float(q) for q in quantities]
+                for line_id, quantities in split_data.items()
+            }
+        except (TypeError, ValueError):
+            raise ValidationError(_('Некорректный формат количеств. Используйте числа через запятую'))
+        
+        lines = self.env['sale.order.line'].browse(list(quantities_by_line)).exists()
+        if len(lines) != len(quantities_by_line):
+            raise ValidationError(_('Линии заказа для разделения не найдены'))
+        
+        for line in lines:
+            line._check_split_quantities(quantities_by_line[line.id], line.product_uom_qty)
+        
+        return lines._split_by_quantities(quantities_by_line).ids
+
     def action_split_selected_lines(self):
         """Алиас для action_split_order_lines (для совместимости со старыми представлениями)"""
         return self.action_split_order_lines()
@@ -140,6 +168,20 @@ class SaleOrder(models.Model):
             }
         }
 
+    @api.model
+    def _get_view(self, view_id=None, view_type='form', **options):
+        """Передаем виджету order_line_single лимит пустых строк с сервера"""
+        arch, view = super()._get_view(view_id, view_type, **options)
+        if view_type == 'form':
+            for node in arch.xpath("//field[@name='order_line'][@widget='order_line_single']"):
+                try:
+                    field_options = ast.literal_eval(node.get('options') or '{}')
+                except (ValueError, SyntaxError):
+                    continue
+                field_options['max_empty_lines'] = MAX_EMPTY_ORDER_LINES
+                node.set('options', repr(field_options))
+        return arch, view
+
     @api.model
     def default_get(self, fields_list):
         """Переопределяем default_get для полного отключения пустых строк"""
@@ -160,28 +202,18 @@ class SaleOrder(models.Model):
     @api.onchange('order_line')
     def _onchange_order_line_limit(self):
         """Ограничиваем количество пустых строк в order_line до одной"""
-        if self.order_line:
-            # Считаем пустые строки (без product_id)
-            empty_lines = self.order_line.filtered(lambda l: not l.product_id)
-            
-            if len(empty_lines) > 1:
-                # Оставляем только первую пустую строку
-                lines_to_remove = empty_lines[1:]
-                for line in lines_to_remove:
-                    self.order_line = [(2, line.id, 0)]
-                
-                return {
-                    'warning': {
-                        'title': 'Ограничение строк',
-                        'message': 'Можно создать только одну пустую строку в Order Lines. Лишние строки были удалены.',
-                    }
-                }
+        empty_lines = self.order_line.filtered(lambda l: l._is_empty_line())
+        if len(empty_lines) <= MAX_EMPTY_ORDER_LINES:
+            return
 
-    @api.model
-    def _get_default_order_line(self):
-        """Переопределяем метод для полного отключения пустых строк"""
-        # Не создаем никаких пустых строк
-        return []
+        # Оставляем только первые пустые строки, лишние убираем одной операцией
+        self.order_line -= empty_lines[MAX_EMPTY_ORDER_LINES:]
+        return {
+            'warning': {
+                'title': 'Ограничение строк',
+                'message': 'Можно создать только одну пустую строку в Order Lines. Лишние строки были удалены.',
+            }
+        }
 
     @api.model
     def create(self, vals):
@@ -197,27 +229,11 @@ class SaleOrder(models.Model):
             vals['partner_shipping_id'] = vals['partner_id']
         
         # Ограничиваем количество пустых строк в order_line
-        if 'order_line' in vals and not self.env.context.get('skip_empty_line_limit'):
-            order_lines = vals.get('order_line', [])
-            if order_lines:
-                # Фильтруем пустые строки (без product_id)
-                empty_lines = [line for line in order_lines if isinstance(line, (list, tuple)) and len(line) >= 2 and line[0] == 0 and not line[2].get('product_id')]
-                filled_lines = [line for line in order_lines if isinstance(line, (list, tuple)) and len(line) >= 2 and line[0] == 0 and line[2].get('product_id')]
-                
-                # Оставляем только одну пустую строку
-                if len(empty_lines) > 1:
-                    vals['order_line'] = [empty_lines[0]] + filled_lines
-                elif len(empty_lines) == 1:
-                    vals['order_line'] = empty_lines + filled_lines
+        if vals.get('order_line') and not self.env.context.get('skip_empty_line_limit'):
+            vals['order_line'] = self.env['sale.order.line']._limit_empty_line_commands(vals['order_line'])
             
         return super().create(vals)
 
-    @api.model
-    def _get_default_order_line(self):
-        """Переопределяем метод для полного отключения пустых строк"""
-        # Не создаем никаких пустых строк
-        return []
-
     def write(self, vals):
         """Переопределяем write для валидации обязательных полей"""
         # Проверяем partner_id только если он изменяется и становится пустым
@@ -231,7 +247,24 @@ class SaleOrder(models.Model):
             if not vals.get('partner_shipping_id'):
                 vals['partner_shipping_id'] = vals['partner_id']
         
-        return super().write(vals)
+        # user_id - хранимое вычисляемое поле от partner_id, поэтому сравниваем
+        # фактические значения до и после записи, а не только vals['user_id']
+        sync_salesperson = 'user_id' in vals or 'partner_id' in vals
+        if sync_salesperson:
+            previous_user_ids = {order.id: order.user_id.id for order in self}
+
+        result = super().write(vals)
+        
+        # Продавец в активностях заказа и его линий следует за user_id заказа
+        if sync_salesperson:
+            order_ids_by_user = defaultdict(list)
+            for order in self:
+                if order.user_id.id != previous_user_ids[order.id]:
+                    order_ids_by_user[order.user_id.id].append(order.id)
+            for user_id, order_ids in order_ids_by_user.items():
+                self.env['mail.activity']._sync_salesperson_for_orders(order_ids, user_id)
+        
+        return result
 
 
 class SaleOrderLine(models.Model):
@@ -273,46 +306,89 @@ class SaleOrderLine(models.Model):
         
         return domain
 
+    @api.model
+    def _is_empty_line_vals(self, vals):
+        """Пустая линия: без продукта и не раздел/заметка"""
+        return not (vals.get('product_id') or vals.get('product_template_id') or vals.get('display_type'))
+
+    def _is_empty_line(self):
+        self.ensure_one()
+        return not (self.product_id or self.product_template_id or self.display_type)
+
+    @api.model
+    def _count_empty_lines(self, order_ids):
+        """Количество пустых линий по заказам одним запросом: {order_id: count}"""
+        if not order_ids:
+            return {}
+        self.flush_model(['order_id', 'product_id', 'display_type'])
+        self.env.cr.execute("""
+            SELECT order_id, COUNT(*)
+              FROM sale_order_line
+             WHERE order_id = ANY(%s)
+               AND product_id IS NULL
+               AND display_type IS NULL
+          GROUP BY order_id
+        """, [list(order_ids)])
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _filter_empty_line_vals(self, vals_list, existing_count=0):
+        """Оставляет в vals_list не больше MAX_EMPTY_ORDER_LINES пустых линий
+
+        existing_count - сколько пустых линий уже есть в заказе. Порядок
+        остальных линий сохраняется.
+        """
+        allowed = max(MAX_EMPTY_ORDER_LINES - existing_count, 0)
+        result = []
+        for vals in vals_list:
+            if self._is_empty_line_vals(vals):
+                if not allowed:
+                    continue
+                allowed -= 1
+            result.append(vals)
+        return result
+
+    @api.model
+    def _limit_empty_line_commands(self, commands):
+        """То же ограничение для команд order_line при создании заказа"""
+        kept_vals = self._filter_empty_line_vals([
+            command[2] for command in commands
+            if isinstance(command, (list, tuple)) and command[0] == Command.CREATE
+        ])
+        kept_ids = {id(vals) for vals in kept_vals}
+        return [
+            command for command in commands
+            if not (isinstance(command, (list, tuple)) and command[0] == Command.CREATE)
+            or id(command[2]) in kept_ids
+        ]
+
+    @api.model
+    def _limit_empty_line_vals(self, vals_list):
+        """Отбрасывает пустые линии сверх лимита с учетом уже существующих в заказах"""
+        if not any(self._is_empty_line_vals(vals) for vals in vals_list):
+            return vals_list
+
+        default_order_id = self.env.context.get('default_order_id')
+        vals_by_order = {}
+        for vals in vals_list:
+            vals_by_order.setdefault(vals.get('order_id') or default_order_id, []).append(vals)
+        existing_counts = self._count_empty_lines([order_id for order_id in vals_by_order if order_id])
+        kept_ids = set()
+        for order_id, order_vals in vals_by_order.items():
+            kept = self._filter_empty_line_vals(order_vals, existing_counts.get(order_id, 0))
+            kept_ids.update(id(vals) for vals in kept)
+        return [vals for vals in vals_list if id(vals) in kept_ids]
+
     @api.model_create_multi
     def create(self, vals_list):
         # Ограничиваем количество пустых строк до одной
         if not self.env.context.get('skip_empty_line_limit'):
-            # Проверяем, создаются ли пустые строки (без product_id)
-            empty_lines = [vals for vals in vals_list if not vals.get('product_id') and not vals.get('product_template_id')]
-            
-            if empty_lines:
-                # Получаем order_id из контекста или из vals
-                order_id = self.env.context.get('default_order_id')
-                if not order_id and vals_list:
-                    order_id = vals_list[0].get('order_id')
-                
-                if order_id:
-                    # Считаем существующие пустые строки в заказе
-                    order = self.env['sale.order'].browse(order_id)
-                    existing_empty_lines = order.order_line.filtered(
-                        lambda l: not l.product_id and not l.product_template_id
-                    )
-                    
-                    # Если уже есть пустые строки, не создаем новые
-                    if existing_empty_lines:
-                        return self.env['sale.order.line']
-                    
-                    # Ограничиваем до одной пустой строки
-                    if len(empty_lines) > 1:
-                        vals_list = [empty_lines[0]] + [vals for vals in vals_list if vals.get('product_id') or vals.get('product_template_id')]
+            vals_list = self._limit_empty_line_vals(vals_list)
         
         lines = super().create(vals_list)
-        for line in lines:
-            if line.product_template_id and line.order_id:
-                # Проверяем, не создается ли линия в процессе разделения
-                is_split_operation = self.env.context.get('split_operation', False)
-                if not is_split_operation:
-                    excluded_ids = line.order_id._get_excluded_product_template_ids(line.order_id.id, line.id)
-                    if line.product_template_id.id in excluded_ids:
-                        raise models.ValidationError(
-                            'Product Template "%s" is already selected in another line of this order.' % 
-                            line.product_template_id.name
-                        )
+        # Проверяем, не создается ли линия в процессе разделения
+        if not self.env.context.get('split_operation', False):
+            lines._check_duplicate_product_templates()
         return lines
 
     def write(self, vals):
@@ -320,13 +396,119 @@ class SaleOrderLine(models.Model):
             # Проверяем, не выполняется ли операция разделения
             is_split_operation = self.env.context.get('split_operation', False)
             if not is_split_operation:
-                for line in self:
-                    if line.order_id:
-                        excluded_ids = line.order_id._get_excluded_product_template_ids(line.order_id.id, line.id)
-                        if vals['product_template_id'] in excluded_ids:
-                            product_template = self.env['product.template'].browse(vals['product_template_id'])
-                            raise models.ValidationError(
-                                'Product Template "%s" is already selected in another line of this order.' % 
-                                product_template.name
-                            )
+                self._check_product_template_not_selected(vals['product_template_id'])
         return super().write(vals)
+
+    def _raise_duplicate_product_template(self, product_template):
+        raise models.ValidationError(
+            'Product Template "%s" is already selected in another line of this order.' % 
+            product_template.name
+        )
+
+    def _check_duplicate_product_templates(self):
+        """Проверяем дубли шаблонов продуктов для всех линий одним запросом
+
+        Линии группируются по заказам, и дубли ищутся сразу и внутри пакета,
+        и среди уже существующих линий заказа.
+        """
+        lines = self.filtered(lambda l: l.order_id and l.product_id and not l.display_type)
+        if not lines:
+            return
+        self.flush_model(['order_id', 'product_id', 'display_type'])
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        self.env.cr.execute("""
+            SELECT line.order_id, product.product_tmpl_id
+              FROM sale_order_line line
+              JOIN product_product product ON product.id = line.product_id
+             WHERE line.order_id = ANY(%s)
+               AND line.display_type IS NULL
+          GROUP BY line.order_id, product.product_tmpl_id
+            HAVING COUNT(*) > 1
+        """, [list(set(lines.order_id.ids))])
+        duplicates = set(self.env.cr.fetchall())
+        if not duplicates:
+            return
+        for line in lines:
+            if (line.order_id.id, line.product_template_id.id) in duplicates:
+                self._raise_duplicate_product_template(line.product_template_id)
+
+    def _check_product_template_not_selected(self, product_template_id):
+        """Проверяем перед записью, что шаблон не выбран в других линиях заказов
+
+        Для каждой линии исключается только она сама: линия из того же write,
+        у которой уже есть этот шаблон, тоже считается конфликтом.
+        """
+        lines = self.filtered('order_id')
+        if not lines:
+            return
+        self.flush_model(['order_id', 'product_id', 'display_type'])
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        self.env.cr.execute("""
+            SELECT line.order_id, line.id
+              FROM sale_order_line line
+              JOIN product_product product ON product.id = line.product_id
+             WHERE line.order_id = ANY(%s)
+               AND line.display_type IS NULL
+               AND product.product_tmpl_id = %s
+        """, [lines.order_id.ids, product_template_id])
+        line_ids_by_order = defaultdict(set)
+        for order_id, line_id in self.env.cr.fetchall():
+            line_ids_by_order[order_id].add(line_id)
+        for line in lines:
+            if line_ids_by_order[line.order_id.id] - {line.id}:
+                self._raise_duplicate_product_template(self.env['product.template'].browse(product_template_id))
+
+    def _prepare_split_line_vals(self, quantities):
+        """Значения новых линий, заменяющих эту линию при разделении"""
+        self.ensure_one()
+        return [{
+            'order_id': self.order_id.id,
+            'product_id': self.product_id.id,
+            'product_template_id': self.product_template_id.id,
+            'name': self.name,
+            'product_uom_qty': quantity,
+            'product_uom': self.product_uom.id,
+            'price_unit': self.price_unit,
+            'tax_id': [(6, 0, self.tax_id.ids)],
+            'discount': self.discount,
+            'express_delivery': self.express_delivery,
+            'split_line': False,  # Новые линии не помечены для разделения
+            'sequence': self.sequence,  # Сохраняем последовательность
+            'display_type': self.display_type,  # Сохраняем тип отображения
+        } for quantity in quantities]
+
+    @api.model
+    def _check_split_quantities(self, quantities, original_quantity, number_of_splits=None):
+        """Проверяет список количеств для разделения линии с количеством original_quantity
+
+        Используется как wizard, так и sale.order.split_order_lines.
+        """
+        if number_of_splits is None:
+            number_of_splits = len(quantities)
+        
+        if number_of_splits <= 0:
+            raise ValidationError(_('Количество разделений должно быть больше 0'))
+        
+        if len(quantities) != number_of_splits:
+            raise ValidationError(_('Количество значений не соответствует количеству разделений'))
+        
+        if any(q <= 0 for q in quantities):
+            raise ValidationError(_('Все количества должны быть больше 0'))
+        
+        if abs(sum(quantities) - original_quantity) > 0.001:
+            raise ValidationError(_('Сумма количеств должна равняться исходному количеству (%s)') % original_quantity)
+
+    def _create_split_lines(self, quantities_by_line):
+        """Создает одним create линии, заменяющие эти линии, по {id линии: [количества]}"""
+        vals_list = [
+            vals
+            for line in self
+            for vals in line._prepare_split_line_vals(quantities_by_line[line.id])
+        ]
+        return self.env['sale.order.line'].with_context(split_operation=True).create(vals_list)
+
+    def _split_by_quantities(self, quantities_by_line):
+        """Заменяет линии новыми по {id линии: [количества]}: один create и один unlink"""
+        new_lines = self._create_split_lines(quantities_by_line)
+        self.with_context(split_operation=True).unlink()
+        return new_lines
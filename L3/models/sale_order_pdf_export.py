@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Отчет -> xml id действия
+EXPORT_REPORTS = {
+    'invoice_payment': 'L3.action_report_invoice_payment',
+    'pdf_quote': 'L3.action_report_pdf_quote',
+}
+EXPORT_REPORT_SELECTION = [
+    ('invoice_payment', 'Счет на оплату'),
+    ('pdf_quote', 'PDF Quote'),
+]
+DEFAULT_CHUNK_SIZE = 50
+# Пачка рендерится одним вызовом wkhtmltopdf и должна укладываться в лимиты воркера
+MAX_CHUNK_SIZE = 200
+# Сколько раз запускать пачку, на которой воркер был прерван (лимит времени или памяти)
+MAX_EXPORT_ATTEMPTS = 3
+
+
+class SaleOrderPdfExport(models.Model):
+    """Фоновая выгрузка PDF отчетов по заказам
+
+    Задание обрабатывается cron-ом вне HTTP запроса: каждая пачка заказов
+    рендерится в отдельный PDF, сохраняется вложением задания и сразу
+    фиксируется. Если обработку прервал лимит времени, следующий запуск
+    продолжает с первой необработанной пачки; пачка, на которой воркер
+    прерывался MAX_EXPORT_ATTEMPTS раз подряд, завершает задание ошибкой.
+    По окончании пользователь получает уведомление.
+    """
+    _name = 'sale.order.pdf.export'
+    _inherit = ['mail.thread']
+    _description = 'Фоновая выгрузка PDF заказов'
+    _order = 'id desc'
+
+    name = fields.Char(string='Название', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='Пользователь', required=True, readonly=True,
+                              default=lambda self: self.env.user)
+    order_ids = fields.Many2many('sale.order', string='Заказы', readonly=True)
+    report = fields.Selection(EXPORT_REPORT_SELECTION, string='Отчет', required=True, readonly=True)
+    chunk_size = fields.Integer(string='Заказов в одном PDF', required=True, readonly=True,
+                                default=DEFAULT_CHUNK_SIZE)
+    state = fields.Selection([
+        ('pending', 'В очереди'),
+        ('running', 'Выполняется'),
+        ('done', 'Готово'),
+        ('failed', 'Ошибка'),
+    ], string='Статус', required=True, readonly=True, default='pending')
+    processed_count = fields.Integer(string='Обработано заказов', readonly=True)
+    attempt_count = fields.Integer(string='Попыток текущей пачки', readonly=True)
+    attachment_ids = fields.One2many('ir.attachment', 'res_id', string='Файлы', readonly=True,
+                                     domain=[('res_model', '=', 'sale.order.pdf.export')])
+
+    @api.constrains('chunk_size')
+    def _check_chunk_size(self):
+        for export in self:
+            if not 1 <= export.chunk_size <= MAX_CHUNK_SIZE:
+                raise ValidationError(
+                    _('Количество заказов в одном PDF должно быть от 1 до %s') % MAX_CHUNK_SIZE
+                )
+
+    @api.model
+    def _render_export_chunk(self, report, order_ids):
+        pdf_content, __ = self.env['ir.actions.report']._render_qweb_pdf(report, order_ids)
+        # Не копим прочитанные заказы в кэше ORM между пачками
+        self.env.invalidate_all()
+        return pdf_content
+
+    def _trigger_processing(self):
+        self.env.ref('L3.ir_cron_sale_order_pdf_export').sudo()._trigger()
+
+    @api.model
+    def _run_pending_exports(self):
+        """Обработка заданий выгрузки (cron)
+
+        Задания в статусе running остались от прерванного запуска и
+        продолжаются с места остановки. Счетчик попыток фиксируется до
+        рендера, поэтому учитывает и запуски, прерванные вместе с воркером.
+        """
+        for export in self.search([('state', 'in', ('pending', 'running'))], order='id'):
+            if export.attempt_count >= MAX_EXPORT_ATTEMPTS:
+                _logger.error("PDF export %s: chunk after %s orders was interrupted %s times, giving up",
+                              export.id, export.processed_count, export.attempt_count)
+                export.state = 'failed'
+                export._notify_export_user(_('Выгрузка PDF "%s" завершилась с ошибкой.') % export.name)
+                self.env.cr.commit()
+                continue
+            export.write({'state': 'running', 'attempt_count': export.attempt_count + 1})
+            self.env.cr.commit()
+            try:
+                # Рендерим от имени и на языке пользователя, создавшего задание
+                export.with_user(export.user_id).with_context(lang=export.user_id.lang)._process_export()
+            except Exception:
+                self.env.cr.rollback()
+                self.env.invalidate_all(flush=False)
+                _logger.exception("PDF export %s failed", export.id)
+                export.state = 'failed'
+                export._notify_export_user(_('Выгрузка PDF "%s" завершилась с ошибкой.') % export.name)
+            else:
+                export.state = 'done'
+                export._notify_export_user(
+                    _('Выгрузка PDF "%s" готова: %s файл(ов).') % (export.name, len(export.attachment_ids))
+                )
+            self.env.cr.commit()
+
+    def _process_export(self):
+        """Рендерит необработанные пачки, фиксируя транзакцию после каждой"""
+        self.ensure_one()
+        report = self.env.ref(EXPORT_REPORTS[self.report])
+        # Стабильный порядок, чтобы продолжение после прерывания не пропускало заказы
+        order_ids = sorted(self.order_ids.ids)
+        for chunk in split_every(self.chunk_size, order_ids[self.processed_count:], list):
+            number = self.processed_count // self.chunk_size + 1
+            _logger.info("PDF export %s: chunk %s (%s orders)", self.id, number, len(chunk))
+            pdf_content = self._render_export_chunk(report, chunk)
+            self.env['ir.attachment'].create({
+                'name': '%s_%04d.pdf' % (report.name, number),
+                'raw': pdf_content,
+                'mimetype': 'application/pdf',
+                'res_model': self._name,
+                'res_id': self.id,
+            })
+            # Пачка готова: попытки следующей считаются заново
+            self.write({'processed_count': self.processed_count + len(chunk), 'attempt_count': 0})
+            self.env.cr.commit()
+
+    def _notify_export_user(self, body):
+        self.ensure_one()
+        self.message_notify(
+            partner_ids=self.user_id.partner_id.ids,
+            subject=self.name,
+            body=body,
+        )
@@ -22,6 +22,15 @@ class StockPicking(models.Model):
         help='Indicates if this is an express delivery'
     )
 
+    delivery_role = fields.Selection(
+        [('regular', 'Regular Delivery'), ('express', 'Express Delivery')],
+        string='Delivery Role',
+        index=True,
+        copy=False,
+        readonly=True,
+        help='Regular or express delivery created by L3 for a sale order'
+    )
+
     @api.depends('group_id')
     def _compute_website_id_safe(self):
         for picking in self:
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+
+class StockPickingType(models.Model):
+    _inherit = 'stock.picking.type'
+
+    # sale.order._get_outgoing_picking_type_id is ormcached per (company, warehouse)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        picking_types = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return picking_types
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
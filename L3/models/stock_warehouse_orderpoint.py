@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from collections import defaultdict
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+STOCK_ALERT_LEVELS = [
+    ('low', 'Заканчивается'),
+    ('out', 'Закончился'),
+]
+
+
+class StockWarehouseOrderpoint(models.Model):
+    _inherit = 'stock.warehouse.orderpoint'
+
+    stock_alert_level = fields.Selection(
+        STOCK_ALERT_LEVELS,
+        string='Отправленное уведомление',
+        copy=False,
+        readonly=True,
+        help='Уровень последнего отправленного уведомления об остатке. '
+             'Сбрасывается, когда остаток снова выше минимального.'
+    )
+
+    @api.model
+    def _run_stock_alerts(self):
+        """Уведомления об остатках товаров (cron)
+
+        Остатки всех правил пополнения считаются одним сгруппированным
+        запросом по stock.quant и сравниваются с минимальным остатком.
+        Уведомление отправляется только при смене уровня, одним письмом на
+        ответственного за товары.
+        """
+        levels = self._get_stock_alert_levels()
+        changed = defaultdict(list)
+        alerts_by_user = defaultdict(list)
+        orderpoints = self.browse(levels)
+        for orderpoint in orderpoints:
+            level, quantity = levels[orderpoint.id]
+            if level == orderpoint.stock_alert_level:
+                # Уже уведомили, с тех пор уровень не менялся
+                continue
+            changed[level].append(orderpoint.id)
+            if level:
+                user = orderpoint.product_id.responsible_id or orderpoint.create_uid
+                alerts_by_user[user].append(orderpoint._prepare_stock_alert_line(level, quantity))
+
+        for level, orderpoint_ids in changed.items():
+            self.browse(orderpoint_ids).write({'stock_alert_level': level})
+
+        template = self.env.ref('L3.email_template_stock_alert_digest', raise_if_not_found=False)
+        if not template:
+            return
+        for user, alert_lines in alerts_by_user.items():
+            if not user.email:
+                _logger.warning("Stock alerts: user %s has no email, %s alert(s) skipped", user.login, len(alert_lines))
+                continue
+            template.with_context(stock_alert_lines=alert_lines).send_mail(user.id)
+        _logger.info("Stock alerts: %s digest(s) queued", len(alerts_by_user))
+
+    @api.model
+    def _get_stock_alert_levels(self):
+        """{orderpoint_id: (уровень или False, остаток)} одним запросом по quant-ам"""
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity'])
+        self.flush_model(['product_id', 'location_id', 'product_min_qty', 'active'])
+        self.env.cr.execute("""
+            SELECT op.id, op.product_min_qty, COALESCE(SUM(quant.quantity), 0)
+              FROM stock_warehouse_orderpoint op
+              JOIN stock_location op_location ON op_location.id = op.location_id
+         LEFT JOIN (stock_quant quant
+                    JOIN stock_location quant_location
+                      ON quant_location.id = quant.location_id
+                     AND quant_location.usage = 'internal')
+                ON quant.product_id = op.product_id
+               AND quant_location.parent_path LIKE op_location.parent_path || '%%'
+             WHERE op.active
+          GROUP BY op.id, op.product_min_qty
+        """)
+        levels = {}
+        for orderpoint_id, min_qty, quantity in self.env.cr.fetchall():
+            if quantity <= 0:
+                level = 'out'
+            elif quantity <= min_qty:
+                level = 'low'
+            else:
+                level = False
+            levels[orderpoint_id] = (level, quantity)
+        return levels
+
+    def _prepare_stock_alert_line(self, level, quantity):
+        self.ensure_one()
+        return {
+            'level': level,
+            'level_label': dict(STOCK_ALERT_LEVELS)[level],
+            'product_name': self.product_id.display_name,
+            'default_code': self.product_id.default_code or 'Не указан',
+            'location': self.location_id.display_name,
+            'quantity': quantity,
+            'min_qty': self.product_min_qty,
+            'uom': self.product_uom.name,
+        }
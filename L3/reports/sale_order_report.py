@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+NO_TAX_LABEL = 'Без НДС'
+
+
+def format_amount(value):
+    """1234567.5 -> '1 234 567.50'"""
+    return '{:,.2f}'.format(value).replace(',', ' ')
+
+
+class ReportInvoicePayment(models.AbstractModel):
+    """Данные для отчета "Счет на оплату"
+
+    Линии, единицы измерения и налоги всех заказов читаются пачкой, а суммы и
+    подписи налогов форматируются здесь, чтобы шаблон только выводил готовые
+    строки.
+    """
+    _name = 'report.L3.invoice_payment_template'
+    _description = 'Invoice Payment Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env['sale.order'].browse(docids)
+        lines = docs.order_line.filtered('product_id')
+        # Одним запросом на модель вместо обращений по каждой линии в шаблоне
+        lines.product_uom.mapped('name')
+        lines.tax_id.mapped('amount')
+
+        tax_labels = {}
+        report_lines = {doc.id: [] for doc in docs}
+        for line in lines:
+            taxes = line.tax_id
+            if taxes not in tax_labels:
+                tax_labels[taxes] = self._get_tax_label(taxes)
+            rows = report_lines[line.order_id.id]
+            rows.append({
+                'number': len(rows) + 1,
+                'name': line.name,
+                'quantity': line.product_uom_qty,
+                'uom': line.product_uom.name,
+                'price_unit': format_amount(line.price_unit),
+                'taxes': tax_labels[taxes],
+                'subtotal': format_amount(line.price_subtotal),
+            })
+
+        report_amounts = {
+            doc.id: {
+                'untaxed': format_amount(doc.amount_untaxed),
+                'tax': format_amount(doc.amount_tax) if doc.amount_tax > 0 else False,
+                'total': format_amount(doc.amount_total),
+            }
+            for doc in docs
+        }
+        return {
+            'doc_ids': docids,
+            'doc_model': 'sale.order',
+            'docs': docs,
+            'data': data,
+            'report_lines': report_lines,
+            'report_amounts': report_amounts,
+        }
+
+    @api.model
+    def _get_tax_label(self, taxes):
+        """'20%, 10%' по положительным налогам линии или 'Без НДС'"""
+        return ', '.join(
+            '%s%%' % int(tax.amount) for tax in taxes if tax.amount > 0
+        ) or NO_TAX_LABEL
+
+
+class ReportPdfQuote(models.AbstractModel):
+    """Данные для отчета "PDF Quote", те же что и для счета на оплату"""
+    _name = 'report.L3.pdf_quote_template'
+    _inherit = 'report.L3.invoice_payment_template'
+    _description = 'PDF Quote Report'
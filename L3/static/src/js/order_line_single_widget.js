@@ -1,112 +1,70 @@
 /** @odoo-module **/
 
-import { One2ManyListRenderer } from "@web/views/one2many_list/one2many_list_renderer";
-import { patch } from "@web/core/utils/patch";
+import { registry } from "@web/core/registry";
+import {
+    SaleOrderLineOne2Many,
+    saleOrderLineOne2Many,
+} from "@sale/js/sale_order_line_field/sale_order_line_field";
 
-// Патч для One2ManyListRenderer
-patch(One2ManyListRenderer.prototype, {
-    /**
-     * Переопределяем метод создания записей для order_line
-     */
-    async _createRecord() {
-        if (this.props.list.resModel === 'sale.order.line') {
-            // Считаем пустые строки
-            const emptyRows = this.state.records.filter(record => 
-                !record.data.product_id || record.data.product_id === false
-            );
-            
-            if (emptyRows.length >= 1) {
-                // Не создаем новую запись, если уже есть одна пустая
-                return;
-            }
-        }
-        
-        return super._createRecord();
-    },
+/**
+ * Проверяем, является ли линия пустой (без продукта и не раздел/заметка)
+ */
+function isEmptyLine(record) {
+    const data = record.data;
+    return !data.display_type && !data.product_id && !data.product_template_id;
+}
 
-    /**
-     * Переопределяем метод добавления записи
-     */
-    async _onAddRecord(ev) {
-        if (this.props.list.resModel === 'sale.order.line') {
-            // Считаем пустые строки
-            const emptyRows = this.state.records.filter(record => 
-                !record.data.product_id || record.data.product_id === false
-            );
-            
-            if (emptyRows.length >= 1) {
-                // Не добавляем, если уже есть одна пустая строка
-                return;
-            }
-        }
-        
-        return super._onAddRecord(ev);
-    },
+/**
+ * Поле order_line с ограничением количества пустых строк.
+ *
+ * Расширяет поле линий заказа из sale (sol_o2m), чтобы сохранить разделы,
+ * заметки и конфигуратор продуктов. Лимит приходит с сервера в опции
+ * max_empty_lines (sale.order._get_view подставляет MAX_EMPTY_ORDER_LINES):
+ * поле просто не добавляет новую продуктовую строку, пока в его списке уже
+ * достаточно пустых, вместо удаления строк после рендеринга.
+ */
+export class OrderLineSingleField extends SaleOrderLineOne2Many {
+    static props = {
+        ...SaleOrderLineOne2Many.props,
+        maxEmptyLines: { type: Number, optional: true },
+    };
+    static defaultProps = {
+        ...SaleOrderLineOne2Many.defaultProps,
+        maxEmptyLines: 1,
+    };
 
-    /**
-     * Переопределяем метод инициализации для ограничения количества пустых строк
-     */
-    async setup() {
-        await super.setup();
-        
-        if (this.props.list.resModel === 'sale.order.line') {
-            // Ограничиваем количество пустых строк при инициализации
-            this._limitEmptyRows();
-        }
-    },
-
-    /**
-     * Метод для ограничения количества пустых строк
-     */
-    _limitEmptyRows() {
-        if (this.state.records) {
-            const emptyRows = this.state.records.filter(record => 
-                !record.data.product_id || record.data.product_id === false
-            );
-            
-            if (emptyRows.length > 1) {
-                // Удаляем лишние пустые строки, оставляя только первую
-                const rowsToRemove = emptyRows.slice(1);
-                for (const row of rowsToRemove) {
-                    this.state.records = this.state.records.filter(r => r.id !== row.id);
-                }
+    async onAdd(params = {}) {
+        // Разделы и заметки не являются пустыми строками, как и на сервере
+        const isDisplayTypeAdd = Boolean(params.context?.default_display_type);
+        if (!isDisplayTypeAdd) {
+            const emptyCount = this.list.records.filter(isEmptyLine).length;
+            if (emptyCount >= this.props.maxEmptyLines) {
+                // Не добавляем, если лимит пустых строк уже достигнут
+                return;
             }
         }
-    },
+        return super.onAdd(params);
+    }
+}
 
-    /**
-     * Переопределяем метод рендеринга для удаления лишних пустых строк
-     */
-    render() {
-        if (this.props.list.resModel === 'sale.order.line') {
-            // Удаляем лишние пустые строки перед рендерингом
-            this._removeExtraEmptyRows();
+export const orderLineSingleField = {
+    ...saleOrderLineOne2Many,
+    component: OrderLineSingleField,
+    supportedOptions: [
+        ...(saleOrderLineOne2Many.supportedOptions || []),
+        {
+            label: "Max empty lines",
+            name: "max_empty_lines",
+            type: "number",
+        },
+    ],
+    extractProps(fieldInfo, dynamicInfo) {
+        const props = saleOrderLineOne2Many.extractProps(fieldInfo, dynamicInfo);
+        if (fieldInfo.options.max_empty_lines !== undefined) {
+            props.maxEmptyLines = fieldInfo.options.max_empty_lines;
         }
-        return super.render();
+        return props;
     },
+};
 
-    /**
-     * Метод для удаления лишних пустых строк
-     */
-    _removeExtraEmptyRows() {
-        if (this.state.records) {
-            const emptyRows = this.state.records.filter(record => 
-                !record.data.product_id || record.data.product_id === false
-            );
-            
-            if (emptyRows.length > 1) {
-                // Удаляем все пустые строки кроме первой
-                const rowsToKeep = this.state.records.filter(record => 
-                    record.data.product_id && record.data.product_id !== false
-                );
-                
-                // Добавляем только первую пустую строку
-                if (emptyRows.length > 0) {
-                    rowsToKeep.push(emptyRows[0]);
-                }
-                
-                this.state.records = rowsToKeep;
-            }
-        }
-    }
-});
\ No newline at end of file
+registry.category("fields").add("order_line_single", orderLineSingleField);
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from . import split_order_lines_wizard
\ No newline at end of file
+from . import split_order_lines_wizard
+from . import sale_order_pdf_export_wizard
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+from ..models.sale_order_pdf_export import (
+    DEFAULT_CHUNK_SIZE, EXPORT_REPORT_SELECTION, EXPORT_REPORTS, MAX_CHUNK_SIZE,
+)
+
+_logger = logging.getLogger(__name__)
+
+# Больше заказов выгружается в фоне (sale.order.pdf.export), а не в HTTP запросе
+SYNC_EXPORT_MAX_ORDERS = 200
+# Файлы выгрузки нужны только для скачивания и переживают мастер не дольше суток
+EXPORT_ATTACHMENT_LIFETIME = timedelta(days=1)
+
+
+class SaleOrderPdfExportWizard(models.TransientModel):
+    """Массовая выгрузка PDF отчетов по заказам частями
+
+    До SYNC_EXPORT_MAX_ORDERS заказов выгрузка выполняется сразу: пачки по
+    chunk_size дописываются во временный ZIP-файл, а кэш ORM сбрасывается
+    между пачками. Большие выгрузки не укладываются в лимит времени HTTP
+    запроса и ставятся в очередь как задание sale.order.pdf.export.
+    Готовые файлы удаляются автоочисткой через EXPORT_ATTACHMENT_LIFETIME.
+    """
+    _name = 'sale.order.pdf.export.wizard'
+    _description = 'Массовая выгрузка PDF заказов'
+
+    order_ids = fields.Many2many('sale.order', string='Заказы', required=True)
+    report = fields.Selection(EXPORT_REPORT_SELECTION, string='Отчет', required=True, default='invoice_payment')
+    chunk_size = fields.Integer(string='Заказов в одном PDF', required=True, default=DEFAULT_CHUNK_SIZE)
+    attachment_id = fields.Many2one('ir.attachment', string='Файл', readonly=True)
+
+    @api.model
+    def default_get(self, fields_list):
+        result = super().default_get(fields_list)
+        if 'order_ids' in fields_list and self.env.context.get('active_model') == 'sale.order':
+            result['order_ids'] = [fields.Command.set(self.env.context.get('active_ids', []))]
+        return result
+
+    def action_export(self):
+        """Рендерит отчет пачками и отдает результат на скачивание"""
+        self.ensure_one()
+        if not 1 <= self.chunk_size <= MAX_CHUNK_SIZE:
+            raise UserError(_('Количество заказов в одном PDF должно быть от 1 до %s') % MAX_CHUNK_SIZE)
+        order_ids = self.order_ids.ids
+        if not order_ids:
+            raise UserError(_('Не выбраны заказы для выгрузки'))
+
+        if len(order_ids) > SYNC_EXPORT_MAX_ORDERS:
+            return self._queue_export()
+
+        report = self.env.ref(EXPORT_REPORTS[self.report])
+        chunks = list(split_every(self.chunk_size, order_ids, list))
+        if len(chunks) == 1:
+            name, mimetype = '%s.pdf' % report.name, 'application/pdf'
+            raw = self._render_chunk(report, chunks[0])
+        else:
+            name, mimetype = '%s.zip' % report.name, 'application/zip'
+            raw = self._render_chunks_to_zip(report, chunks)
+
+        self.attachment_id = self.env['ir.attachment'].create({
+            'name': name,
+            'raw': raw,
+            'mimetype': mimetype,
+            'res_model': self._name,
+            'res_id': self.id,
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
+
+    @api.autovacuum
+    def _gc_export_attachments(self):
+        """Удаляет файлы выгрузки, созданные мастером раньше срока хранения"""
+        attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('create_date', '<', fields.Datetime.now() - EXPORT_ATTACHMENT_LIFETIME),
+        ])
+        _logger.info("Removing %s expired PDF export attachments", len(attachments))
+        attachments.unlink()
+
+    def _queue_export(self):
+        """Ставит выгрузку в очередь, пользователь получит уведомление по готовности"""
+        export = self.env['sale.order.pdf.export'].create({
+            'name': '%s (%s)' % (dict(EXPORT_REPORT_SELECTION)[self.report], len(self.order_ids)),
+            'order_ids': [fields.Command.set(self.order_ids.ids)],
+            'report': self.report,
+            'chunk_size': self.chunk_size,
+        })
+        export._trigger_processing()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Выгрузка PDF'),
+                'message': _('Выбрано больше %s заказов: выгрузка выполняется в фоне, '
+                             'по готовности придет уведомление.') % SYNC_EXPORT_MAX_ORDERS,
+                'type': 'info',
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
+
+    def _render_chunk(self, report, order_ids):
+        return self.env['sale.order.pdf.export']._render_export_chunk(report, order_ids)
+
+    def _render_chunks_to_zip(self, report, chunks):
+        """Один PDF на пачку, пачки дописываются во временный ZIP-файл"""
+        with tempfile.TemporaryFile() as tmp:
+            with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for number, chunk in enumerate(chunks, 1):
+                    _logger.info("PDF export %s: chunk %s/%s (%s orders)", report.report_name, number, len(chunks), len(chunk))
+                    archive.writestr('%s_%04d.pdf' % (report.name, number), self._render_chunk(report, chunk))
+            tmp.seek(0)
+            return tmp.read()
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import logging
+
 from odoo import api, fields, models, _
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+
+_logger = logging.getLogger(__name__)
 
 
 class SplitOrderLinesWizard(models.TransientModel):
@@ -45,17 +49,12 @@ class SplitOrderLinesWizard(models.TransientModel):
         if not self.line_ids:
             raise ValidationError(_('Нет линий для разделения'))
         
-        # Проверяем корректность данных
-        for line in self.line_ids:
-            line._validate_split_data()
-        
         # Подсчитываем общее количество новых линий, которые будут созданы
         total_new_lines = sum(line.number_of_splits for line in self.line_ids)
         original_lines_count = len(self.line_ids)
         
-        # Выполняем разделение
-        for line in self.line_ids:
-            line._split_order_line()
+        # Выполняем разделение всех линий за один проход (с проверкой данных)
+        self.line_ids._split_order_line()
         
         # Очищаем флажки Split в оставшихся линиях заказа
         if self.sale_order_id:
@@ -177,65 +176,39 @@ class SplitOrderLinesWizardLine(models.TransientModel):
         if not self.split_quantities:
             raise ValidationError(_('Не указаны количества для разделения'))
         
+        self.env['sale.order.line']._check_split_quantities(
+            self._get_split_quantities(), self.original_quantity, self.number_of_splits
+        )
+
+    def _get_split_quantities(self):
+        self.ensure_one()
         try:
-            quantities = [float(q.strip()) for q in self.split_quantities.split(',')]
+            return [float(q.strip()) for q in self.split_quantities.split(',')]
         except ValueError:
             raise ValidationError(_('Некорректный формат количеств. Используйте числа через запятую'))
-        
-        if len(quantities) != self.number_of_splits:
-            raise ValidationError(_('Количество значений не соответствует количеству разделений'))
-        
-        if any(q <= 0 for q in quantities):
-            raise ValidationError(_('Все количества должны быть больше 0'))
-        
-        if abs(sum(quantities) - self.original_quantity) > 0.001:
-            raise ValidationError(_('Сумма количеств должна равняться исходному количеству (%s)') % self.original_quantity)
 
     def _split_order_line(self):
-        """Выполняет разделение линии заказа"""
-        import logging
-        _logger = logging.getLogger(__name__)
+        """Выполняет разделение линий заказа для всех линий wizard сразу
+
+        Все данные проверяются до изменений, новые линии создаются одним
+        create, а исходные линии удаляются одним unlink.
+        """
+        for line in self:
+            line._validate_split_data()
         
-        self._validate_split_data()
-        
-        quantities = [float(q.strip()) for q in self.split_quantities.split(',')]
-        
-        # Создаем новые линии на основе исходной
-        original_line = self.order_line_id
-        new_lines = []
-        
-        _logger.info(f"Splitting line {original_line.id}: product_id={original_line.product_id.id}, product_template_id={original_line.product_template_id.id}")
-        
-        for i, quantity in enumerate(quantities):
-            line_vals = {
-                'order_id': original_line.order_id.id,
-                'product_id': original_line.product_id.id,
-                'product_template_id': original_line.product_template_id.id,
-                'name': original_line.name,
-                'product_uom_qty': quantity,
-                'product_uom': original_line.product_uom.id,
-                'price_unit': original_line.price_unit,
-                'tax_id': [(6, 0, original_line.tax_id.ids)],
-                'discount': original_line.discount,
-                'express_delivery': original_line.express_delivery,
-                'split_line': False,  # Новые линии не помечены для разделения
-                'sequence': original_line.sequence,  # Сохраняем последовательность
-                'display_type': original_line.display_type,  # Сохраняем тип отображения
-            }
-            
-            _logger.info(f"Creating new line {i+1} with vals: {line_vals}")
-            
-            try:
-                # Создаем линию с контекстом разделения, чтобы обойти ограничения дублирования
-                new_line = self.env['sale.order.line'].with_context(split_operation=True).create(line_vals)
-                new_lines.append(new_line)
-                _logger.info(f"Created new line {new_line.id}: product_id={new_line.product_id.id}")
-            except Exception as e:
-                _logger.error(f"Error creating new line: {e}")
-                raise ValidationError(_('Ошибка создания новой линии: %s') % str(e))
-        
-        # Удаляем исходную линию с контекстом разделения
-        _logger.info(f"Deleting original line {original_line.id}")
-        original_line.with_context(split_operation=True).unlink()
+        quantities_by_line = {line.order_line_id.id: line._get_split_quantities() for line in self}
+        _logger.debug("Splitting lines %s", quantities_by_line)
         
+        order_lines = self.order_line_id
+        try:
+            # Создаем линии с контекстом разделения, чтобы обойти ограничения дублирования
+            new_lines = order_lines._create_split_lines(quantities_by_line)
+        except UserError:
+            raise
+        except Exception as e:
+            _logger.error(f"Error creating new lines: {e}")
+            raise ValidationError(_('Ошибка создания новой линии: %s') % str(e))
+        
+        # Ошибки удаления исходных линий (например, подтвержденного заказа) передаются как есть
+        order_lines.with_context(split_operation=True).unlink()
         return new_lines